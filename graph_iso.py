@@ -7,12 +7,52 @@ import hashlib
 import json
 import re
 import subprocess
+import tempfile
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 
 CONDITIONAL_LOOP_PREFIXES = ("loop",)
 UNCONDITIONAL_JUMPS = {"jmp", "jmpq", "ljmp"}
+OBJDUMP_CHUNK_SIZE = 1 << 16
+
+# One objdump instruction line: address, raw opcode bytes (skipped), mnemonic, operands.
+INSTRUCTION_RE = re.compile(
+    rb"^[ \t]*([0-9a-fA-F]+)[ \t]*:[ \t]*(?:[0-9a-fA-F]{2}[ \t]+)*"
+    rb"(?![0-9a-fA-F]{2}(?:[ \t]|$))([^ \t\n]+)[ \t]*(.*)$",
+    re.MULTILINE,
+)
+# Jump target, preferring "addr <symbol>", then "0xaddr", then a bare 4+ digit hex address.
+TARGET_RE = re.compile(
+    rb"(?:.*?\b([0-9a-fA-F]+)\s*<|.*?\b0x([0-9a-fA-F]+)\b|.*?\b([0-9a-fA-F]{4,})\b)"
+)
+
+# Rolling window fingerprints are polynomial sums over the Mersenne prime 2**61 - 1.
+FINGERPRINT_MODULUS = (1 << 61) - 1
+FINGERPRINT_BASE = 0x5BD1E995
+
+# Process-wide small-int ids for mnemonics and edge types, used in place of strings by
+# the compare columns; ids are stable within a process, so graphs compare consistently.
+_MNEMONIC_IDS: dict[str, int] = {}
+_EDGE_TYPE_NAMES: list[str] = ["jmp", "seq"]
+_EDGE_TYPE_IDS: dict[str, int] = {name: index for index, name in enumerate(_EDGE_TYPE_NAMES)}
+JMP_EDGE = _EDGE_TYPE_IDS["jmp"]
+SEQ_EDGE = _EDGE_TYPE_IDS["seq"]
+
+# Columns and caches used by compare; never written to graph JSON as-is.
+GRAPH_ARRAY_KEYS = (
+    "node_labels",
+    "label_bytes",
+    "edge_src",
+    "edge_dst",
+    "edge_type",
+    "edge_offsets",
+    "window_terms",
+)
 
 
 def is_elf(path: Path) -> bool:
@@ -30,56 +70,47 @@ def is_conditional_jump(mnemonic: str) -> bool:
     return any(name.startswith(prefix) for prefix in CONDITIONAL_LOOP_PREFIXES)
 
 
-def parse_instruction_line(line: str) -> tuple[int, str, str] | None:
-    if ":" not in line:
+def parse_instruction_line(line: bytes) -> tuple[int, str, bytes] | None:
+    match = INSTRUCTION_RE.match(line)
+    if match is None:
         return None
-    left, right = line.split(":", 1)
-    left = left.strip()
-    if not left or any(ch not in "0123456789abcdefABCDEF" for ch in left):
-        return None
-
-    address = int(left, 16)
-    tokens = right.strip().split()
-    if not tokens:
-        return None
-
-    index = 0
-    while index < len(tokens) and re.fullmatch(r"[0-9a-fA-F]{2}", tokens[index]):
-        index += 1
+    return _instruction_from_match(match)
 
-    if index >= len(tokens):
-        return None
 
-    mnemonic = tokens[index]
-    operands = " ".join(tokens[index + 1 :])
-    return address, mnemonic, operands
+def _instruction_from_match(match: re.Match[bytes]) -> tuple[int, str, bytes]:
+    address, mnemonic, operands = match.groups()
+    return int(address, 16), mnemonic.decode("utf-8", "replace"), operands
 
 
-def parse_target_address(operands: str) -> int | None:
+def parse_target_address(operands: bytes) -> int | None:
     if not operands:
         return None
 
-    symbol_form = re.search(r"\b([0-9a-fA-F]+)\s*<", operands)
-    if symbol_form:
-        return int(symbol_form.group(1), 16)
-
-    hex_form = re.search(r"\b0x([0-9a-fA-F]+)\b", operands)
-    if hex_form:
-        return int(hex_form.group(1), 16)
-
-    plain_form = re.search(r"\b([0-9a-fA-F]{4,})\b", operands)
-    if plain_form:
-        return int(plain_form.group(1), 16)
-
-    return None
+    match = TARGET_RE.match(operands)
+    if match is None:
+        return None
+    return int(match.group(match.lastindex), 16)
 
 
-def run_objdump(binary: Path) -> str:
+def run_objdump(binary: Path) -> Iterator[bytes]:
+    # Yield disassembly in runs of whole lines while objdump is still writing, so
+    # parsing overlaps with disassembly instead of waiting for the full output.
     command = ["objdump", "-d", str(binary)]
-    process = subprocess.run(command, capture_output=True, text=True, check=False)
-    if process.returncode != 0:
-        raise RuntimeError(f"objdump failed: {process.stderr.strip() or process.stdout.strip()}")
-    return process.stdout
+    with tempfile.TemporaryFile() as errors:
+        with subprocess.Popen(command, stdout=subprocess.PIPE, stderr=errors) as process:
+            pending = b""
+            for chunk in iter(lambda: process.stdout.read1(OBJDUMP_CHUNK_SIZE), b""):
+                chunk = pending + chunk
+                cut = chunk.rfind(b"\n") + 1
+                pending = chunk[cut:]
+                if cut:
+                    yield chunk[:cut]
+            if pending:
+                yield pending
+        if process.returncode != 0:
+            errors.seek(0)
+            message = errors.read().strip().decode("utf-8", "replace")
+            raise RuntimeError(f"objdump failed: {message}")
 
 
 def build_graph_from_binary(binary: Path) -> dict[str, Any]:
@@ -88,56 +119,97 @@ def build_graph_from_binary(binary: Path) -> dict[str, Any]:
     if not is_elf(binary):
         raise ValueError(f"File is not an ELF executable: {binary}")
 
-    disassembly = run_objdump(binary)
     nodes: list[dict[str, Any]] = []
+    node_labels = array("H")
     jump_targets: list[int | None] = []
     addr_to_node_id: dict[int, int] = {}
 
-    for line in disassembly.splitlines():
-        parsed = parse_instruction_line(line)
-        if parsed is None:
-            continue
-        address, mnemonic, operands = parsed
-        if not is_conditional_jump(mnemonic):
-            continue
-
-        node_id = len(nodes)
-        addr_to_node_id[address] = node_id
-        target = parse_target_address(operands)
-        jump_targets.append(target)
-        nodes.append(
-            {
-                "id": node_id,
-                "address": f"0x{address:x}",
-                "mnemonic": mnemonic.lower(),
-                "target": f"0x{target:x}" if target is not None else None,
-            }
-        )
-
-    edge_set: set[tuple[int, int, str]] = set()
+    for disassembly in run_objdump(binary):
+        for match in INSTRUCTION_RE.finditer(disassembly):
+            address, mnemonic, operands = _instruction_from_match(match)
+            if not is_conditional_jump(mnemonic):
+                continue
+            label = mnemonic.lower()
+
+            node_id = len(nodes)
+            addr_to_node_id[address] = node_id
+            target = parse_target_address(operands)
+            jump_targets.append(target)
+            node_labels.append(_mnemonic_id(label))
+            nodes.append(
+                {
+                    "id": node_id,
+                    "address": f"0x{address:x}",
+                    "mnemonic": label,
+                    "target": f"0x{target:x}" if target is not None else None,
+                }
+            )
+
+    edge_set: set[tuple[int, int, int]] = set()
     for index in range(len(nodes) - 1):
-        edge_set.add((index, index + 1, "seq"))
+        edge_set.add((index, index + 1, SEQ_EDGE))
 
     for src, target_addr in enumerate(jump_targets):
         if target_addr is None:
             continue
         dst = addr_to_node_id.get(target_addr)
         if dst is not None:
-            edge_set.add((src, dst, "jmp"))
+            edge_set.add((src, dst, JMP_EDGE))
+
+    edge_rows = sorted(edge_set)
+
+    return attach_graph_arrays(
+        {
+            "version": 1,
+            "binary": str(binary),
+            "node_count": len(nodes),
+            "edge_count": len(edge_rows),
+            "nodes": nodes,
+        },
+        node_labels,
+        edge_rows,
+    )
 
-    edges = [
-        {"src": src, "dst": dst, "type": edge_type}
-        for src, dst, edge_type in sorted(edge_set, key=lambda item: (item[0], item[1], item[2]))
-    ]
 
-    return {
-        "version": 1,
-        "binary": str(binary),
-        "node_count": len(nodes),
-        "edge_count": len(edges),
-        "nodes": nodes,
-        "edges": edges,
-    }
+def _mnemonic_id(mnemonic: str) -> int:
+    return _MNEMONIC_IDS.setdefault(mnemonic, len(_MNEMONIC_IDS))
+
+
+def _edge_type_id(edge_type: str) -> int:
+    if edge_type not in _EDGE_TYPE_IDS:
+        _EDGE_TYPE_IDS[edge_type] = len(_EDGE_TYPE_NAMES)
+        _EDGE_TYPE_NAMES.append(edge_type)
+    return _EDGE_TYPE_IDS[edge_type]
+
+
+def attach_graph_arrays(
+    graph: dict[str, Any], node_labels: array, edge_rows: list[tuple[int, int, int]]
+) -> dict[str, Any]:
+    # edge_rows are (src, dst, edge type id) sorted ascending.
+    graph["node_labels"] = node_labels
+    graph["label_bytes"] = node_labels.tobytes()
+    graph["edge_src"] = array("I", [src for src, _, _ in edge_rows])
+    graph["edge_dst"] = array("I", [dst for _, dst, _ in edge_rows])
+    graph["edge_type"] = array("B", [edge_type for _, _, edge_type in edge_rows])
+
+    # CSR offsets: edges leaving node i are edge_*[edge_offsets[i]:edge_offsets[i + 1]].
+    offsets = array("I", [0] * (graph["node_count"] + 1))
+    for src, _, _ in edge_rows:
+        offsets[src + 1] += 1
+    for index in range(1, len(offsets)):
+        offsets[index] += offsets[index - 1]
+    graph["edge_offsets"] = offsets
+    return graph
+
+
+def graph_to_json(graph: dict[str, Any]) -> dict[str, Any]:
+    # Edges live only in the compare columns; edge dicts are built just for output.
+    payload = {key: value for key, value in graph.items() if key not in GRAPH_ARRAY_KEYS}
+    payload["edges"] = [
+        {"src": src, "dst": dst, "type": _EDGE_TYPE_NAMES[edge_type]}
+        for src, dst, edge_type in zip(graph["edge_src"], graph["edge_dst"], graph["edge_type"])
+    ]
+    return payload
 
 
 def load_graph(path: Path) -> dict[str, Any]:
@@ -147,39 +219,201 @@ def load_graph(path: Path) -> dict[str, Any]:
     missing = required - set(data)
     if missing:
         raise ValueError(f"Graph file missing required keys: {sorted(missing)}")
-    return data
+    node_labels = array("H", [_mnemonic_id(node["mnemonic"]) for node in data["nodes"]])
+    edge_rows = sorted((edge["src"], edge["dst"], _edge_type_id(edge["type"])) for edge in data.pop("edges"))
+    return attach_graph_arrays(data, node_labels, edge_rows)
 
 
-def window_fingerprint(graph: dict[str, Any], start: int, size: int) -> str:
+def window_fingerprint(graph: dict[str, Any], start: int, size: int) -> bytes:
     stop = start + size
-    id_map = {old: new for new, old in enumerate(range(start, stop))}
+    width = graph["node_labels"].itemsize
+    labels = graph["label_bytes"][start * width : stop * width]
 
-    node_labels = tuple(graph["nodes"][old]["mnemonic"] for old in range(start, stop))
-    edge_tuples: list[tuple[int, int, str]] = []
-    for edge in graph["edges"]:
-        src = edge["src"]
-        dst = edge["dst"]
-        if start <= src < stop and start <= dst < stop:
-            edge_tuples.append((id_map[src], id_map[dst], edge["type"]))
+    offsets = graph["edge_offsets"]
+    low, high = offsets[start], offsets[stop]
 
-    edge_tuples.sort()
-    payload = {"labels": node_labels, "edges": edge_tuples}
-    encoded = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
-    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+    packed_edges = array("I")
+    edge_columns = (graph["edge_src"][low:high], graph["edge_dst"][low:high], graph["edge_type"][low:high])
+    for src, dst, edge_type in zip(*edge_columns):
+        if start <= dst < stop:
+            packed_edges.extend((src - start, dst - start, edge_type))
+
+    hasher = hashlib.blake2b(labels, digest_size=16)
+    hasher.update(packed_edges.tobytes())
+    return hasher.digest()
+
+
+@lru_cache(maxsize=None)
+def _hash64(key: int) -> int:
+    digest = hashlib.blake2b(key.to_bytes(8, "little", signed=True), digest_size=8).digest()
+    return int.from_bytes(digest, "little") % FINGERPRINT_MODULUS
+
+
+def _window_terms(graph: dict[str, Any]) -> dict[str, list[Any]]:
+    terms = graph.get("window_terms")
+    if terms is not None:
+        return terms
+
+    node_count = graph["node_count"]
+    modulus = FINGERPRINT_MODULUS
+    inverse_base = pow(FINGERPRINT_BASE, modulus - 2, modulus)
+    weights = [1] * node_count
+    inverse_weights = [1] * node_count
+    for index in range(1, node_count):
+        weights[index] = weights[index - 1] * FINGERPRINT_BASE % modulus
+        inverse_weights[index] = inverse_weights[index - 1] * inverse_base % modulus
+
+    # Each node and edge contributes hash * BASE**position, so any window's sum comes
+    # from prefix sums; scaling by BASE**-start makes it independent of where the
+    # window starts, like the remapped ids in window_fingerprint.
+    label_prefix = [0] * (node_count + 1)
+    for index, label in enumerate(graph["node_labels"]):
+        label_prefix[index + 1] = (label_prefix[index] + _hash64(label) * weights[index]) % modulus
+
+    edge_rows = sorted(
+        (abs(dst - src), min(src, dst), max(src, dst), _hash64((dst - src) << 32 | edge_type) * weights[src] % modulus)
+        for src, dst, edge_type in zip(graph["edge_src"], graph["edge_dst"], graph["edge_type"])
+    )
+    terms = {
+        "label_prefix": label_prefix,
+        "inverse_weights": inverse_weights,
+        "edge_rows": edge_rows,
+        "edge_spans": [span for span, _, _, _ in edge_rows],
+    }
+    graph["window_terms"] = terms
+    return terms
 
 
-def collect_window_map(graph: dict[str, Any], size: int) -> dict[str, list[int]]:
+def collect_window_map(graph: dict[str, Any], size: int) -> dict[int, list[int]]:
     node_count = graph["node_count"]
     if size <= 0 or size > node_count:
         return {}
 
-    result: dict[str, list[int]] = {}
-    for start in range(0, node_count - size + 1):
-        fp = window_fingerprint(graph, start, size)
+    terms = _window_terms(graph)
+    # An edge (low, high) with span < size lies inside exactly the windows starting in
+    # [high - size + 1, low]; record that range as a difference array over starts.
+    edge_deltas = [0] * (node_count + 1)
+    for _, low, high, term in terms["edge_rows"][: bisect_left(terms["edge_spans"], size)]:
+        edge_deltas[max(0, high - size + 1)] += term
+        edge_deltas[low + 1] -= term
+
+    result: dict[int, list[int]] = {}
+    fingerprints = _collect_fingerprints(terms["label_prefix"], edge_deltas, terms["inverse_weights"], size)
+    for start, fp in enumerate(fingerprints):
         result.setdefault(fp, []).append(start)
     return result
 
 
+def _collect_fingerprints(
+    label_prefix: list[int],
+    edge_deltas: list[int],
+    inverse_weights: list[int],
+    size: int,
+) -> list[int]:
+    modulus = FINGERPRINT_MODULUS
+    fingerprints: list[int] = []
+    append = fingerprints.append
+    edge_sum = 0
+    for inverse, label_low, label_high, edge_delta in zip(
+        inverse_weights, label_prefix, label_prefix[size:], edge_deltas
+    ):
+        edge_sum += edge_delta
+        append(((label_high - label_low) * inverse % modulus) << 64 | (edge_sum * inverse % modulus))
+    return fingerprints
+
+
+def _shared_window_maps(
+    left: dict[str, Any], right: dict[str, Any], size: int
+) -> tuple[dict[int, list[int]], dict[int, list[int]]] | None:
+    left_windows = collect_window_map(left, size)
+    if not left_windows:
+        return None
+    right_windows = collect_window_map(right, size)
+    matches = _iter_matches(left, right, left_windows, right_windows, size, "left", "right")
+    if next(matches, None) is None:
+        return None
+    return left_windows, right_windows
+
+
+def _keep_window_maps(
+    window_maps: dict[tuple[int, int], dict[int, list[int]]],
+    maps: tuple[dict[int, list[int]], dict[int, list[int]]],
+    size: int,
+    size_filter: int | None,
+) -> None:
+    # Only the latest passing size can be best_size, the one size the scan is sure to
+    # read first; smaller sizes may never be reached before --max-report is met.
+    window_maps.clear()
+    if size_filter is None or size == size_filter:
+        window_maps[0, size], window_maps[1, size] = maps
+
+
+def _cached_digest(digests: dict[int, bytes], graph: dict[str, Any], start: int, size: int) -> bytes:
+    digest = digests.get(start)
+    if digest is None:
+        digest = digests[start] = window_fingerprint(graph, start, size)
+    return digest
+
+
+def _iter_matches(
+    left: dict[str, Any],
+    right: dict[str, Any],
+    left_windows: dict[int, list[int]],
+    right_windows: dict[int, list[int]],
+    size: int,
+    left_name: str,
+    right_name: str,
+) -> Iterator[dict[str, int]]:
+    left_key = f"{left_name}_start"
+    right_key = f"{right_name}_start"
+    # Intersecting the key views walks the smaller map and probes the larger one,
+    # without copying either into a transient set.
+    # A rolling fingerprint can collide within either graph's bucket, so every
+    # reported pair is confirmed with the exact window digests. Digests are computed
+    # on first use, so a caller that stops early only pays for the pairs it consumed.
+    left_digests: dict[int, bytes] = {}
+    right_digests: dict[int, bytes] = {}
+    for fingerprint in left_windows.keys() & right_windows.keys():
+        right_starts = right_windows[fingerprint]
+        for left_start in left_windows[fingerprint]:
+            left_digest = _cached_digest(left_digests, left, left_start, size)
+            for right_start in right_starts:
+                if left_digest == _cached_digest(right_digests, right, right_start, size):
+                    yield {left_key: left_start, right_key: right_start, "size": size}
+
+
+def _largest_shared_size(
+    left: dict[str, Any],
+    right: dict[str, Any],
+    min_size: int,
+    max_size: int,
+    window_maps: dict[tuple[int, int], dict[int, list[int]]],
+    size_filter: int | None,
+) -> int:
+    # An exact rebuild shares the whole smaller graph, and at max_size that graph has
+    # a single window, so this cheap probe goes first and skips the bisection.
+    if min_size <= max_size:
+        maps = _shared_window_maps(left, right, max_size)
+        if maps is not None:
+            _keep_window_maps(window_maps, maps, max_size, size_filter)
+            return max_size
+
+    # Every prefix of a matching window is itself a matching window, so sharing a
+    # window of some size is monotone in size and the largest one can be bisected.
+    best_size = 0
+    low, high = min_size, max_size - 1
+    while low <= high:
+        size = (low + high) // 2
+        maps = _shared_window_maps(left, right, size)
+        if maps is not None:
+            _keep_window_maps(window_maps, maps, size, size_filter)
+            best_size = size
+            low = size + 1
+        else:
+            high = size - 1
+    return best_size
+
+
 def compare_graphs(
     left: dict[str, Any],
     right: dict[str, Any],
@@ -191,48 +425,29 @@ def compare_graphs(
     size_filter: int | None,
 ) -> dict[str, Any]:
     max_size = min(left["node_count"], right["node_count"])
-    best_matches: list[dict[str, int]] = []
-    all_matches: list[dict[str, int]] = []
-    best_size = 0
+    matches: list[dict[str, int]] = []
 
-    for size in range(max_size, min_size - 1, -1):
-        left_windows = collect_window_map(left, size)
-        right_windows = collect_window_map(right, size)
-        overlap = set(left_windows) & set(right_windows)
-        if not overlap:
-            continue
+    # Window maps for best_size kept from bisection, keyed by (side, size), so the
+    # scan below does not fingerprint that size twice.
+    window_maps: dict[tuple[int, int], dict[int, list[int]]] = {}
 
-        for fingerprint in overlap:
-            for left_start in left_windows[fingerprint]:
-                for right_start in right_windows[fingerprint]:
-                    match = {
-                        f"{left_name}_start": left_start,
-                        f"{right_name}_start": right_start,
-                        "size": size,
-                    }
-                    passes_filter = (size_filter is None) or (size == size_filter)
-                    if (size == best_size or best_size == 0) and passes_filter:
-                        best_matches.append(match)
-                    if collect_all_sizes and passes_filter:
-                        all_matches.append(match)
-                    reported_count = len(all_matches) if collect_all_sizes else len(best_matches)
-                    if reported_count >= max_report:
-                        break
-                reported_count = len(all_matches) if collect_all_sizes else len(best_matches)
-                if reported_count >= max_report:
-                    break
-            reported_count = len(all_matches) if collect_all_sizes else len(best_matches)
-            if reported_count >= max_report:
-                break
-
-        if best_size == 0:
-            best_size = size
-            if not collect_all_sizes:
-                break
-        if collect_all_sizes and len(all_matches) >= max_report:
+    best_size = _largest_shared_size(left, right, min_size, max_size, window_maps, size_filter)
+
+    # Sizes above best_size share nothing, so the all-sizes scan can start there.
+    last_size = min_size if collect_all_sizes else best_size
+    sizes = range(best_size, last_size - 1, -1) if best_size else range(0)
+
+    for size in sizes:
+        if size_filter is not None and size != size_filter:
+            continue
+        remaining = max_report - len(matches)
+        if remaining <= 0:
             break
 
-    reported_matches = all_matches if collect_all_sizes else best_matches
+        left_windows = window_maps.pop((0, size), None) or collect_window_map(left, size)
+        right_windows = window_maps.pop((1, size), None) or collect_window_map(right, size)
+        pairs = _iter_matches(left, right, left_windows, right_windows, size, left_name, right_name)
+        matches.extend(islice(pairs, remaining))
 
     min_nodes = min(left["node_count"], right["node_count"])
     fit_ratio = (best_size / min_nodes) if min_nodes else 0.0
@@ -242,8 +457,8 @@ def compare_graphs(
         "collect_all_sizes": collect_all_sizes,
         "min_size_considered": min_size,
         "size_filter": size_filter,
-        "match_count_reported": len(reported_matches),
-        "matches": reported_matches,
+        "match_count_reported": len(matches),
+        "matches": matches,
     }
 
 
@@ -256,7 +471,7 @@ def write_json(path: Path, payload: dict[str, Any]) -> None:
 
 def cmd_extract(args: argparse.Namespace) -> int:
     graph = build_graph_from_binary(Path(args.binary))
-    write_json(Path(args.output), graph)
+    write_json(Path(args.output), graph_to_json(graph))
     print(f"Wrote graph with {graph['node_count']} nodes and {graph['edge_count']} edges to {args.output}")
     return 0
 
@@ -266,7 +481,7 @@ def cmd_compare(args: argparse.Namespace) -> int:
     prior_graph = load_graph(Path(args.prior_graph))
 
     if args.extracted_output:
-        write_json(Path(args.extracted_output), new_graph)
+        write_json(Path(args.extracted_output), graph_to_json(new_graph))
 
     report = compare_graphs(
         left=prior_graph,
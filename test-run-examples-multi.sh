@@ -9,9 +9,19 @@ SIZE_FILTER="${1:-}"
 
 mkdir -p "${BIN_DIR}" "${OUT_DIR}"
 
+# Rebuild only when the binary is missing or older than its source; FORCE_BUILD=1 always rebuilds.
+build_example() {
+  local src="$1" out="$2"
+  if [[ -z "${FORCE_BUILD:-}" && -e "${out}" && ! "${src}" -nt "${out}" ]]; then
+    echo "  ${out} is up to date"
+    return
+  fi
+  gcc -O0 -fno-inline -fno-omit-frame-pointer "${src}" -o "${out}"
+}
+
 echo "[1/4] Building multi-match example binaries"
-gcc -O0 -fno-inline -fno-omit-frame-pointer "${SRC_DIR}/prog_multi_a.c" -o "${BIN_DIR}/prog_multi_a"
-gcc -O0 -fno-inline -fno-omit-frame-pointer "${SRC_DIR}/prog_multi_b.c" -o "${BIN_DIR}/prog_multi_b"
+build_example "${SRC_DIR}/prog_multi_a.c" "${BIN_DIR}/prog_multi_a"
+build_example "${SRC_DIR}/prog_multi_b.c" "${BIN_DIR}/prog_multi_b"
 
 echo "[2/4] Extracting graph from prog_multi_a"
 python3 "${ROOT_DIR}/graph_iso.py" extract \
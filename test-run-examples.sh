@@ -8,9 +8,19 @@ OUT_DIR="${ROOT_DIR}/out-examples"
 
 mkdir -p "${BIN_DIR}" "${OUT_DIR}"
 
+# Rebuild only when the binary is missing or older than its source; FORCE_BUILD=1 always rebuilds.
+build_example() {
+  local src="$1" out="$2"
+  if [[ -z "${FORCE_BUILD:-}" && -e "${out}" && ! "${src}" -nt "${out}" ]]; then
+    echo "  ${out} is up to date"
+    return
+  fi
+  gcc -O0 -fno-inline -fno-omit-frame-pointer "${src}" -o "${out}"
+}
+
 echo "[1/4] Building example binaries"
-gcc -O0 -fno-inline -fno-omit-frame-pointer "${SRC_DIR}/prog_a.c" -o "${BIN_DIR}/prog_a"
-gcc -O0 -fno-inline -fno-omit-frame-pointer "${SRC_DIR}/prog_b.c" -o "${BIN_DIR}/prog_b"
+build_example "${SRC_DIR}/prog_a.c" "${BIN_DIR}/prog_a"
+build_example "${SRC_DIR}/prog_b.c" "${BIN_DIR}/prog_b"
 
 echo "[2/4] Extracting graph from prog_a"
 python3 "${ROOT_DIR}/graph_iso.py" extract \